@@ -6,9 +6,18 @@ from typing import List
 # Filepaths
 DATA_FILE: str = os.path.join("data", "housing.csv")
 MODEL_FILE: str = os.path.join("models", "model.joblib")
+# CSV the model was trained on, in the lower-case schema read by models.model.prepare_data
+TRAIN_DATA_FILE: str = os.path.join("models", "housing.csv")
 DB_FILE: str = "housing_data.db"
 PREDICTIONS_FILE: str = "predictions.csv"
 
+# Rows written per checkpointed chunk; a restarted run resumes at the first incomplete chunk
+CHUNK_SIZE: int = 1000
+
+# Drift monitoring: bins per histogram and PSI above which a column is reported as drifted
+DRIFT_BINS: int = 10
+DRIFT_PSI_THRESHOLD: float = 0.2
+
 # Used in preprocessor to work properly
 TARGET_COLUMN = "median_house_value"
 
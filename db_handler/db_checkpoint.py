@@ -0,0 +1,191 @@
+import sqlite3
+from sqlite3 import Connection
+from typing import Optional, Set
+from config import logger
+
+
+# Pipeline stages that are checkpointed chunk by chunk
+STAGE_CLEANED_DATA = "cleaned_data"
+STAGE_PREDICTIONS = "predictions"
+
+# Run statuses stored in the 'runs' table
+RUN_RUNNING = "running"
+RUN_FAILED = "failed"
+RUN_COMPLETED = "completed"
+
+
+def create_run_tables(conn: Connection) -> None:
+    """
+    Create the tables used to checkpoint pipeline runs.
+
+    The 'runs' table holds one row per pipeline run, and 'run_progress' holds
+    one marker per chunk that was fully written for a given stage.
+
+    Args:
+        conn (Connection): SQLite connection object.
+
+    Raises:
+        sqlite3.Error: If table creation fails.
+    """
+    try:
+        conn.execute("""
+        CREATE TABLE IF NOT EXISTS runs (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            source_file TEXT NOT NULL,
+            fingerprint TEXT NOT NULL,
+            total_chunks INTEGER NOT NULL,
+            status TEXT NOT NULL,
+            error TEXT,
+            started_at TEXT DEFAULT CURRENT_TIMESTAMP,
+            finished_at TEXT
+        );
+        """)
+        conn.execute("""
+        CREATE TABLE IF NOT EXISTS run_progress (
+            run_id INTEGER NOT NULL REFERENCES runs (id),
+            stage TEXT NOT NULL,
+            chunk_index INTEGER NOT NULL,
+            row_count INTEGER NOT NULL,
+            completed_at TEXT DEFAULT CURRENT_TIMESTAMP,
+            PRIMARY KEY (run_id, stage, chunk_index)
+        );
+        """)
+        conn.commit()
+        logger.info("Tables 'runs' and 'run_progress' created successfully.")
+    except sqlite3.Error as e:
+        logger.error(f"Error creating run tables: {e}")
+        raise
+
+
+def start_run(
+    conn: Connection, source_file: str, fingerprint: str, total_chunks: int
+) -> int:
+    """
+    Resume the latest unfinished run for the same input, or start a new one.
+
+    A run is resumed when it was not completed and was started for an input
+    with the same fingerprint and chunk count, so its chunk markers still
+    describe the same rows.
+
+    Args:
+        conn (Connection): SQLite connection object.
+        source_file (str): Path to the input file being processed.
+        fingerprint (str): Content hash of the input file.
+        total_chunks (int): Number of chunks the input is split into.
+
+    Returns:
+        int: ID of the resumed or newly created run.
+
+    Raises:
+        sqlite3.Error: If the run cannot be read or created.
+    """
+    try:
+        row = conn.execute(
+            """
+            SELECT id FROM runs
+            WHERE fingerprint = ? AND total_chunks = ? AND status != ?
+            ORDER BY id DESC LIMIT 1
+            """,
+            (fingerprint, total_chunks, RUN_COMPLETED),
+        ).fetchone()
+        with conn:
+            if row:
+                run_id = row[0]
+                conn.execute(
+                    "UPDATE runs SET status = ?, error = NULL WHERE id = ?",
+                    (RUN_RUNNING, run_id),
+                )
+                logger.info(f"Resuming unfinished run {run_id} for {source_file}.")
+            else:
+                cur = conn.execute(
+                    """
+                    INSERT INTO runs (source_file, fingerprint, total_chunks, status)
+                    VALUES (?, ?, ?, ?)
+                    """,
+                    (source_file, fingerprint, total_chunks, RUN_RUNNING),
+                )
+                run_id = cur.lastrowid
+                logger.info(f"Started new run {run_id} for {source_file}.")
+        return run_id
+    except sqlite3.Error as e:
+        logger.error(f"Error starting run: {e}")
+        raise
+
+
+def get_completed_chunks(conn: Connection, run_id: int, stage: str) -> Set[int]:
+    """
+    Get the chunk indexes already written for a stage of a run.
+
+    Args:
+        conn (Connection): SQLite connection object.
+        run_id (int): ID of the run.
+        stage (str): Pipeline stage name.
+
+    Returns:
+        Set[int]: Indexes of the completed chunks.
+
+    Raises:
+        sqlite3.Error: If the progress markers cannot be read.
+    """
+    try:
+        rows = conn.execute(
+            "SELECT chunk_index FROM run_progress WHERE run_id = ? AND stage = ?",
+            (run_id, stage),
+        ).fetchall()
+        return {row[0] for row in rows}
+    except sqlite3.Error as e:
+        logger.error(f"Error reading progress for run {run_id}: {e}")
+        raise
+
+
+def record_chunk(
+    conn: Connection, run_id: int, stage: str, chunk_index: int, row_count: int
+) -> None:
+    """
+    Write the progress marker for a chunk without committing.
+
+    Callers run this inside the same transaction as the chunk's inserts, so
+    the marker exists if and only if the chunk's rows were committed.
+
+    Args:
+        conn (Connection): SQLite connection object.
+        run_id (int): ID of the run.
+        stage (str): Pipeline stage name.
+        chunk_index (int): Index of the chunk within the run.
+        row_count (int): Number of rows written for the chunk.
+    """
+    conn.execute(
+        """
+        INSERT INTO run_progress (run_id, stage, chunk_index, row_count)
+        VALUES (?, ?, ?, ?)
+        """,
+        (run_id, stage, chunk_index, row_count),
+    )
+
+
+def finish_run(conn: Connection, run_id: int, error: Optional[str] = None) -> None:
+    """
+    Mark a run as completed, or as failed when an error is given.
+
+    Args:
+        conn (Connection): SQLite connection object.
+        run_id (int): ID of the run.
+        error (Optional[str]): Error message if the run failed.
+
+    Raises:
+        sqlite3.Error: If the run status cannot be updated.
+    """
+    status = RUN_FAILED if error else RUN_COMPLETED
+    try:
+        with conn:
+            conn.execute(
+                """
+                UPDATE runs SET status = ?, error = ?, finished_at = CURRENT_TIMESTAMP
+                WHERE id = ?
+                """,
+                (status, error, run_id),
+            )
+        logger.info(f"Run {run_id} marked as {status}.")
+    except sqlite3.Error as e:
+        logger.error(f"Error updating status of run {run_id}: {e}")
+        raise
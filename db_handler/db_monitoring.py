@@ -0,0 +1,203 @@
+import sqlite3
+from sqlite3 import Connection
+from typing import List, Optional, Tuple
+from config import logger
+
+
+# Histogram name used for prediction residuals (actual - predicted)
+RESIDUAL_COLUMN = "residual"
+
+
+def create_drift_tables(conn: Connection) -> None:
+    """
+    Create the tables used for drift monitoring.
+
+    'drift_baseline' holds the fixed bins of every monitored column together with
+    the training counts, and 'drift_histograms' holds the counts of ingested rows
+    per run in the same bins. A NULL bound means the bin is open on that side.
+
+    Args:
+        conn (Connection): SQLite connection object.
+
+    Raises:
+        sqlite3.Error: If table creation fails.
+    """
+    try:
+        conn.execute("""
+        CREATE TABLE IF NOT EXISTS drift_baseline (
+            column_name TEXT NOT NULL,
+            bin_index INTEGER NOT NULL,
+            lower REAL,
+            upper REAL,
+            count INTEGER NOT NULL,
+            PRIMARY KEY (column_name, bin_index)
+        );
+        """)
+        conn.execute("""
+        CREATE TABLE IF NOT EXISTS drift_histograms (
+            run_id INTEGER NOT NULL,
+            column_name TEXT NOT NULL,
+            bin_index INTEGER NOT NULL,
+            count INTEGER NOT NULL,
+            PRIMARY KEY (run_id, column_name, bin_index)
+        );
+        """)
+        conn.commit()
+        logger.info("Tables 'drift_baseline' and 'drift_histograms' created successfully.")
+    except sqlite3.Error as e:
+        logger.error(f"Error creating drift tables: {e}")
+        raise
+
+
+def has_drift_baseline(conn: Connection) -> bool:
+    """
+    Check whether a training baseline has been stored.
+
+    Args:
+        conn (Connection): SQLite connection object.
+
+    Returns:
+        bool: True if at least one baseline bin exists.
+
+    Raises:
+        sqlite3.Error: If the baseline table cannot be read.
+    """
+    try:
+        return conn.execute("SELECT 1 FROM drift_baseline LIMIT 1").fetchone() is not None
+    except sqlite3.Error as e:
+        logger.error(f"Error checking for drift baseline: {e}")
+        raise
+
+
+def save_drift_baseline(
+    conn: Connection, bins: List[Tuple[str, int, Optional[float], Optional[float], int]]
+) -> None:
+    """
+    Replace the stored baseline. Existing histograms are cleared, since their
+    counts refer to the old bins.
+
+    Args:
+        conn (Connection): SQLite connection object.
+        bins (List[Tuple]): Rows of (column_name, bin_index, lower, upper, count).
+
+    Raises:
+        sqlite3.Error: If the baseline cannot be saved.
+    """
+    try:
+        with conn:
+            conn.execute("DELETE FROM drift_baseline")
+            conn.execute("DELETE FROM drift_histograms")
+            conn.executemany(
+                """
+                INSERT INTO drift_baseline (column_name, bin_index, lower, upper, count)
+                VALUES (?, ?, ?, ?, ?)
+                """,
+                bins,
+            )
+        logger.info(f"Saved drift baseline with {len(bins)} bins.")
+    except sqlite3.Error as e:
+        logger.error(f"Error saving drift baseline: {e}")
+        raise
+
+
+def _update_histograms(
+    conn: Connection, values_query: str, run_id: int, chunk_index: int
+) -> None:
+    """
+    Bin the (column_name, value) rows returned by values_query and add the
+    counts to the run's histograms. Does not commit.
+    """
+    # 'WHERE true' keeps SQLite from parsing ON CONFLICT as part of the join
+    conn.execute(
+        f"""
+        INSERT INTO drift_histograms (run_id, column_name, bin_index, count)
+        SELECT :run_id, b.column_name, b.bin_index, COUNT(*)
+        FROM ({values_query}) AS v
+        JOIN drift_baseline AS b
+            ON b.column_name = v.column_name
+            AND (b.lower IS NULL OR v.value >= b.lower)
+            AND (b.upper IS NULL OR v.value < b.upper)
+        WHERE true
+        GROUP BY b.column_name, b.bin_index
+        ON CONFLICT (run_id, column_name, bin_index)
+        DO UPDATE SET count = count + excluded.count
+        """,
+        {"run_id": run_id, "chunk_index": chunk_index},
+    )
+
+
+def update_feature_histograms(
+    conn: Connection, columns: List[str], run_id: int, chunk_index: int
+) -> None:
+    """
+    Add one chunk of 'cleaned_data' to the feature histograms without committing.
+
+    Only the chunk's rows are read, so the cost depends on the chunk size and
+    not on the size of the table. Callers run this inside the chunk's insert
+    transaction so a resumed run never counts a chunk twice.
+
+    Args:
+        conn (Connection): SQLite connection object.
+        columns (List[str]): Sanitized feature column names in 'cleaned_data'.
+        run_id (int): ID of the run the chunk belongs to.
+        chunk_index (int): Index of the chunk within the run.
+    """
+    values_query = " UNION ALL ".join(
+        f"SELECT '{column}' AS column_name, {column} AS value FROM cleaned_data "
+        "WHERE run_id = :run_id AND chunk_index = :chunk_index"
+        for column in columns
+    )
+    _update_histograms(conn, values_query, run_id, chunk_index)
+
+
+def update_residual_histogram(conn: Connection, run_id: int, chunk_index: int) -> None:
+    """
+    Add the residuals of one chunk of 'predictions' to the residual histogram
+    without committing.
+
+    Args:
+        conn (Connection): SQLite connection object.
+        run_id (int): ID of the run the chunk belongs to.
+        chunk_index (int): Index of the chunk within the run.
+    """
+    values_query = (
+        f"SELECT '{RESIDUAL_COLUMN}' AS column_name, actual - predicted AS value FROM predictions "
+        "WHERE run_id = :run_id AND chunk_index = :chunk_index"
+    )
+    _update_histograms(conn, values_query, run_id, chunk_index)
+
+
+def get_histograms(
+    conn: Connection, run_id: Optional[int] = None
+) -> List[Tuple[str, int, int, int]]:
+    """
+    Get baseline and current counts for every bin.
+
+    Args:
+        conn (Connection): SQLite connection object.
+        run_id (Optional[int]): Restrict current counts to one run. All runs are
+            summed when omitted.
+
+    Returns:
+        List[Tuple[str, int, int, int]]: Rows of
+            (column_name, bin_index, baseline_count, current_count).
+
+    Raises:
+        sqlite3.Error: If the histograms cannot be read.
+    """
+    run_filter = "AND h.run_id = :run_id" if run_id is not None else ""
+    try:
+        return conn.execute(
+            f"""
+            SELECT b.column_name, b.bin_index, b.count, COALESCE(SUM(h.count), 0)
+            FROM drift_baseline AS b
+            LEFT JOIN drift_histograms AS h
+                ON h.column_name = b.column_name AND h.bin_index = b.bin_index {run_filter}
+            GROUP BY b.column_name, b.bin_index
+            ORDER BY b.column_name, b.bin_index
+            """,
+            {"run_id": run_id},
+        ).fetchall()
+    except sqlite3.Error as e:
+        logger.error(f"Error getting drift histograms: {e}")
+        raise
@@ -1,7 +1,33 @@
 import sqlite3
 from sqlite3 import Connection
-from typing import List, Tuple
+from typing import Dict, List, Tuple
 from config import logger
+from db_handler.db_checkpoint import (
+    STAGE_CLEANED_DATA,
+    STAGE_PREDICTIONS,
+    record_chunk,
+)
+from db_handler.db_monitoring import update_feature_histograms, update_residual_histogram
+
+# Columns linking stored rows to the run and chunk that wrote them
+RUN_COLUMNS: Dict[str, str] = {"run_id": "INTEGER", "chunk_index": "INTEGER"}
+
+
+def sanitize_features(features: List[str]) -> List[str]:
+    """Replace characters that are invalid in column names with underscores."""
+    return [
+        feature.replace(" ", "_").replace("<", "_LT_").replace(">", "_GT_")
+        for feature in features
+    ]
+
+
+def _add_missing_columns(conn: Connection, table: str, columns: Dict[str, str]) -> None:
+    """Add columns to a table created by an older version of the pipeline."""
+    existing = {row[1] for row in conn.execute(f"PRAGMA table_info({table})")}
+    for name, column_type in columns.items():
+        if name not in existing:
+            conn.execute(f"ALTER TABLE {table} ADD COLUMN {name} {column_type}")
+            logger.info(f"Column '{name}' added to table '{table}'.")
 
 
 def create_cleaned_data_table(conn: Connection, features: List[str]) -> None:
@@ -16,20 +42,23 @@ def create_cleaned_data_table(conn: Connection, features: List[str]) -> None:
         sqlite3.Error: If table creation fails.
     """
     # Replace invalid characters with underscores
-    sanitized_features = [
-        feature.replace(" ", "_").replace("<", "_LT_").replace(">", "_GT_")
-        for feature in features
-    ]
+    sanitized_features = sanitize_features(features)
     feature_columns = ", ".join([f"{feature} REAL" for feature in sanitized_features])
     query = f"""
     CREATE TABLE IF NOT EXISTS cleaned_data (
         id INTEGER PRIMARY KEY AUTOINCREMENT,
         {feature_columns},
-        target REAL
+        target REAL,
+        run_id INTEGER,
+        chunk_index INTEGER
     );
     """
     try:
         conn.execute(query)
+        _add_missing_columns(conn, "cleaned_data", RUN_COLUMNS)
+        conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_cleaned_data_run_chunk ON cleaned_data (run_id, chunk_index)"
+        )
         logger.info("Table 'cleaned_data' created successfully.")
     except sqlite3.Error as e:
         logger.error(f"Error creating table 'cleaned_data': {e}")
@@ -52,10 +81,7 @@ def insert_cleaned_data(
     """
     try:
         # Sanitize column names
-        sanitized_features = [
-            feature.replace(" ", "_").replace("<", "_LT_").replace(">", "_GT_")
-            for feature in features
-        ]
+        sanitized_features = sanitize_features(features)
         columns = ", ".join(sanitized_features + ["target"])
         placeholders = ", ".join(["?"] * (len(features) + 1))  # +1 for the target
         query = f"INSERT INTO cleaned_data ({columns}) VALUES ({placeholders})"
@@ -84,10 +110,16 @@ def create_predictions_table(conn: Connection) -> None:
         CREATE TABLE IF NOT EXISTS predictions (
             id INTEGER PRIMARY KEY AUTOINCREMENT,
             actual REAL,
-            predicted REAL
+            predicted REAL,
+            run_id INTEGER,
+            chunk_index INTEGER
         );
         """
         conn.execute(query)
+        _add_missing_columns(conn, "predictions", RUN_COLUMNS)
+        conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_predictions_run_chunk ON predictions (run_id, chunk_index)"
+        )
         logger.info("Table 'predictions' created successfully.")
     except sqlite3.Error as e:
         logger.error(f"Error creating table 'predictions': {e}")
@@ -115,6 +147,114 @@ def insert_predictions(conn: Connection, data: List[Tuple[float, float]]) -> Non
         raise
 
 
+def insert_cleaned_data_chunk(
+    conn: Connection,
+    features: List[str],
+    data: List[Tuple],
+    run_id: int,
+    chunk_index: int,
+    track_drift: bool = False,
+) -> None:
+    """
+    Insert one chunk of preprocessed data and its progress marker atomically.
+
+    Args:
+        conn (Connection): SQLite connection object.
+        features (List[str]): List of feature column names.
+        data (List[Tuple]): Chunk rows to insert, including target values.
+        run_id (int): ID of the run the chunk belongs to.
+        chunk_index (int): Index of the chunk within the run.
+        track_drift (bool): Also add the chunk to the feature drift histograms.
+
+    Raises:
+        sqlite3.Error: If data insertion fails. Nothing from the chunk is kept.
+    """
+    try:
+        sanitized_features = sanitize_features(features)
+        columns = ", ".join(sanitized_features + ["target", "run_id", "chunk_index"])
+        placeholders = ", ".join(["?"] * (len(features) + 3))  # +3 for target, run_id, chunk_index
+        query = f"INSERT INTO cleaned_data ({columns}) VALUES ({placeholders})"
+        with conn:
+            conn.executemany(query, [(*row, run_id, chunk_index) for row in data])
+            if track_drift:
+                update_feature_histograms(conn, sanitized_features, run_id, chunk_index)
+            record_chunk(conn, run_id, STAGE_CLEANED_DATA, chunk_index, len(data))
+        logger.info(
+            f"Inserted chunk {chunk_index} ({len(data)} rows) into 'cleaned_data' for run {run_id}."
+        )
+    except sqlite3.Error as e:
+        logger.error(f"Error inserting cleaned data chunk {chunk_index}: {e}")
+        raise
+
+
+def insert_predictions_chunk(
+    conn: Connection,
+    data: List[Tuple[float, float]],
+    run_id: int,
+    chunk_index: int,
+    track_drift: bool = False,
+) -> None:
+    """
+    Insert one chunk of predictions and its progress marker atomically.
+
+    Args:
+        conn (Connection): SQLite connection object.
+        data (List[Tuple[float, float]]): Tuples with actual and predicted values.
+        run_id (int): ID of the run the chunk belongs to.
+        chunk_index (int): Index of the chunk within the run.
+        track_drift (bool): Also add the chunk to the residual drift histogram.
+
+    Raises:
+        sqlite3.Error: If data insertion fails. Nothing from the chunk is kept.
+    """
+    try:
+        query = """
+        INSERT INTO predictions (actual, predicted, run_id, chunk_index)
+        VALUES (?, ?, ?, ?)
+        """
+        with conn:
+            conn.executemany(query, [(*row, run_id, chunk_index) for row in data])
+            if track_drift:
+                update_residual_histogram(conn, run_id, chunk_index)
+            record_chunk(conn, run_id, STAGE_PREDICTIONS, chunk_index, len(data))
+        logger.info(
+            f"Inserted chunk {chunk_index} ({len(data)} rows) into 'predictions' for run {run_id}."
+        )
+    except sqlite3.Error as e:
+        logger.error(f"Error inserting predictions chunk {chunk_index}: {e}")
+        raise
+
+
+def get_run_predictions(conn: Connection, run_id: int) -> List[Tuple[float, float]]:
+    """
+    Get the actual and predicted values stored for a run, in input order.
+
+    Args:
+        conn (Connection): SQLite connection object.
+        run_id (int): ID of the run.
+
+    Returns:
+        List[Tuple[float, float]]: Tuples with actual and predicted values.
+
+    Raises:
+        sqlite3.Error: If the predictions cannot be read.
+    """
+    try:
+        rows = conn.execute(
+            """
+            SELECT actual, predicted FROM predictions
+            WHERE run_id = ?
+            ORDER BY chunk_index, id
+            """,
+            (run_id,),
+        ).fetchall()
+        logger.info(f"Selected {len(rows)} predictions for run {run_id}.")
+        return rows
+    except sqlite3.Error as e:
+        logger.error(f"Error getting predictions for run {run_id}: {e}")
+        raise
+
+
 def get_cleaned_data(conn: Connection) -> List[Tuple]:
     try:
         with conn.cursor() as cur:
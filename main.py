@@ -1,7 +1,9 @@
 # Import configuration variables
-from config import DATA_FILE, MODEL_FILE, DB_FILE, PREDICTIONS_FILE, EXPECTED_FEATURES, logger
+from config import DATA_FILE, MODEL_FILE, DB_FILE, PREDICTIONS_FILE, EXPECTED_FEATURES, CHUNK_SIZE, DRIFT_PSI_THRESHOLD, logger
 
-from typing import List, Tuple
+from sqlite3 import Connection
+from typing import List, Optional, Tuple
+import hashlib
 import pandas as pd
 import os
 
@@ -12,17 +14,91 @@ from db_handler.db_connector import create_connection, close_connection
 from db_handler.db_query import (
     create_cleaned_data_table,
     create_predictions_table,
-    insert_cleaned_data,
-    insert_predictions
+    insert_cleaned_data_chunk,
+    insert_predictions_chunk,
+    get_run_predictions
 )
+from db_handler.db_checkpoint import (
+    STAGE_CLEANED_DATA,
+    STAGE_PREDICTIONS,
+    create_run_tables,
+    start_run,
+    get_completed_chunks,
+    finish_run
+)
+from db_handler.db_monitoring import create_drift_tables, has_drift_baseline
+from monitoring.drift import compute_drift_scores
+
+
+def _file_fingerprint(path: str) -> str:
+    """
+    Compute a SHA-256 hash of a file's contents.
+
+    Args:
+        path (str): Path to the file.
+
+    Returns:
+        str: Hex digest of the file contents.
+    """
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def _run_fingerprint(data_file: str, model_file: str) -> str:
+    """
+    Identify everything that determines a run's output, so a restarted run only
+    resumes when its input, model, chunking and feature list are all unchanged.
+
+    Args:
+        data_file (str): Path to the input data file.
+        model_file (str): Path to the model file.
+
+    Returns:
+        str: Hex digest combining the file hashes, CHUNK_SIZE and EXPECTED_FEATURES.
+    """
+    parts = [
+        _file_fingerprint(data_file),
+        _file_fingerprint(model_file),
+        str(CHUNK_SIZE),
+        ",".join(EXPECTED_FEATURES),
+    ]
+    return hashlib.sha256("|".join(parts).encode()).hexdigest()
+
+
+def _mark_run_failed(conn: Optional[Connection], run_id: Optional[int], error: Exception) -> None:
+    """
+    Record a failed run so the next run can resume it. Never masks the original error.
+
+    Args:
+        conn (Optional[Connection]): SQLite connection object.
+        run_id (Optional[int]): ID of the current run, if one was started.
+        error (Exception): The error that stopped the run.
+    """
+    if conn and run_id is not None:
+        try:
+            finish_run(conn, run_id, error=str(error) or type(error).__name__)
+        except Exception as e:
+            logger.error(f"Could not mark run {run_id} as failed: {e}")
+
 
 def run_pipeline() -> None:
     """
     Main function to run the house price prediction pipeline.
     Includes preprocessing, database insertion, prediction, and saving outputs.
+
+    Database writes are checkpointed per chunk of CHUNK_SIZE rows. If a previous
+    run on the same input and model did not complete, its finished chunks are skipped and
+    processing resumes at the first incomplete chunk.
+
+    If a drift baseline has been built (`python -m monitoring.drift`), feature and
+    residual histograms are updated with each chunk and drift scores are logged.
     """
     logger.info("Starting the house price prediction pipeline...")
     conn = None
+    run_id = None
 
     try:
         # Step 1: Preprocess the data
@@ -30,8 +106,8 @@ def run_pipeline() -> None:
         features, target = preprocess_housing_data(DATA_FILE)
         logger.info(f"Preprocessing completed. Features shape: {features.shape}, Target size: {len(target)}")
         
-        # Combine features and target into tuples for database insertion
-        cleaned_data: List[Tuple] = [(*features.iloc[i], target.iloc[i]) for i in range(len(features))]
+        # Split the data into chunks that are checkpointed independently
+        chunk_starts = range(0, len(features), CHUNK_SIZE)
 
         # Step 2: Ingest data into SQLite database
         logger.info("Step 2: Connecting to the database...")
@@ -40,39 +116,80 @@ def run_pipeline() -> None:
         logger.info("Creating tables in the database...")
         create_cleaned_data_table(conn, EXPECTED_FEATURES)
         create_predictions_table(conn)
+        create_run_tables(conn)
+        create_drift_tables(conn)
+
+        track_drift = has_drift_baseline(conn)
+        if not track_drift:
+            logger.warning("No drift baseline found. Run 'python -m monitoring.drift <training csv>' to enable drift monitoring.")
+
+        run_id = start_run(conn, DATA_FILE, _run_fingerprint(DATA_FILE, MODEL_FILE), len(chunk_starts))
 
         logger.info("Inserting cleaned data into the database...")
-        insert_cleaned_data(conn, EXPECTED_FEATURES, cleaned_data)
-        logger.info(f"Inserted {len(cleaned_data)} rows into the database.")
+        done = get_completed_chunks(conn, run_id, STAGE_CLEANED_DATA)
+        for chunk_index, start in enumerate(chunk_starts):
+            if chunk_index in done:
+                logger.debug(f"Chunk {chunk_index} of 'cleaned_data' already inserted, skipping.")
+                continue
+            # Cast to float so numpy ints/bools are stored as REAL rather than BLOB
+            chunk_features = features.iloc[start:start + CHUNK_SIZE].astype(float)
+            chunk_target = target.iloc[start:start + CHUNK_SIZE].astype(float)
+            # Combine features and target into tuples for database insertion
+            cleaned_data: List[Tuple] = [
+                (*row, y) for row, y in zip(chunk_features.itertuples(index=False), chunk_target)
+            ]
+            insert_cleaned_data_chunk(conn, EXPECTED_FEATURES, cleaned_data, run_id, chunk_index, track_drift)
+        logger.info(f"Cleaned data for {len(features)} rows is in the database ({len(done)} chunks resumed).")
 
         # Step 3: Load the trained model
         logger.info("Step 3: Loading the trained model...")
         model = load_model(MODEL_FILE)
 
-        # Step 4: Make predictions
+        # Step 4: Make predictions and save them to SQLite database chunk by chunk
         logger.info("Step 4: Making predictions using the model...")
-        predictions = predict(features, model)
+        done = get_completed_chunks(conn, run_id, STAGE_PREDICTIONS)
+        for chunk_index, start in enumerate(chunk_starts):
+            if chunk_index in done:
+                logger.debug(f"Chunk {chunk_index} of 'predictions' already inserted, skipping.")
+                continue
+            chunk_features = features.iloc[start:start + CHUNK_SIZE]
+            chunk_target = target.iloc[start:start + CHUNK_SIZE].astype(float)
+            chunk_predictions = predict(chunk_features, model)
+            prediction_data: List[Tuple] = [
+                (y, float(y_pred)) for y, y_pred in zip(chunk_target, chunk_predictions)
+            ]
+            insert_predictions_chunk(conn, prediction_data, run_id, chunk_index, track_drift)
+        stored = get_run_predictions(conn, run_id)
+        actual = [row[0] for row in stored]
+        predictions = [row[1] for row in stored]
         logger.info(f"Predictions completed. Number of predictions: {len(predictions)}")
 
         # Step 5: Evaluate model performance
         logger.info("Step 5: Evaluating model performance...")
-        error = mean_absolute_error(target, predictions)
+        error = mean_absolute_error(actual, predictions)
         logger.info(f"Mean Absolute Error (MAE): {error}")
 
         # Step 6: Save predictions to a CSV file
         logger.info("Step 6: Saving predictions to a CSV file...")
         predictions_df = pd.DataFrame({
-            "Actual": target,
+            "Actual": actual,
             "Predicted": predictions
         })
         predictions_df.to_csv(PREDICTIONS_FILE, index=False)
         logger.info(f"Predictions saved to {PREDICTIONS_FILE}")
 
-        # Step 7: Save predictions to SQLite database
-        logger.info("Step 7: Saving predictions to the database...")
-        prediction_data: List[Tuple] = [(target.iloc[i], predictions[i]) for i in range(len(predictions))]
-        insert_predictions(conn, prediction_data)
-        logger.info("Predictions saved to the database.")
+        # Step 7: Check input and residual drift against the training baseline
+        if track_drift:
+            logger.info("Step 7: Checking drift against the training baseline...")
+            drift = compute_drift_scores(conn, run_id, expected_rows=len(features))
+            logger.info(f"Drift scores:\n{drift}")
+            drifted = drift.index[drift["psi"] > DRIFT_PSI_THRESHOLD].tolist()
+            if drifted:
+                logger.warning(f"Drift detected (PSI > {DRIFT_PSI_THRESHOLD}) in columns: {drifted}")
+
+        # Step 8: Mark the run as completed
+        logger.info("Step 8: Marking the run as completed...")
+        finish_run(conn, run_id)
 
         # Display the first few predictions
         logger.debug("Predictions (first 5 rows):")
@@ -80,12 +197,15 @@ def run_pipeline() -> None:
 
     except FileNotFoundError as e:
         logger.error(f"File error: {e}")
+        _mark_run_failed(conn, run_id, e)
         raise  # Re-raise the exception
     except pd.errors.EmptyDataError as e:
         logger.error(f"Data error: {e}")
+        _mark_run_failed(conn, run_id, e)
         raise  # Re-raise the exception
     except Exception as e:
         logger.error(f"Unexpected error: {e}")
+        _mark_run_failed(conn, run_id, e)
         raise  # Re-raise the exception
     finally:
         if conn:
@@ -0,0 +1,182 @@
+import argparse
+import numpy as np
+import pandas as pd
+from sqlite3 import Connection
+from typing import List, Optional, Tuple
+from config import TRAIN_DATA_FILE, DB_FILE, MODEL_FILE, EXPECTED_FEATURES, TARGET_COLUMN, DRIFT_BINS, logger
+
+from csv_processor.preprocessor import preprocess_housing_data
+from models.model import prepare_data, load_model, predict
+from db_handler.db_connector import create_connection, close_connection
+from db_handler.db_query import sanitize_features
+from db_handler.db_monitoring import (
+    RESIDUAL_COLUMN,
+    create_drift_tables,
+    save_drift_baseline,
+    get_histograms
+)
+
+# Floor for bin proportions so empty bins do not make PSI infinite
+PSI_EPSILON = 1e-4
+
+
+def compute_bins(
+    column_name: str, values: np.ndarray, bins: int = DRIFT_BINS
+) -> List[Tuple[str, int, Optional[float], Optional[float], int]]:
+    """
+    Split values into quantile bins and count them.
+
+    Bin edges are the unique quantiles of the values, including the minimum and
+    maximum, with open-ended bins below and above so later values outside the
+    training range are still counted. Low-cardinality columns such as one-hot
+    encodings get one bin per distinct value.
+
+    Args:
+        column_name (str): Name of the monitored column.
+        values (np.ndarray): Baseline values of the column.
+        bins (int): Number of quantile bins to aim for.
+
+    Returns:
+        List[Tuple]: Rows of (column_name, bin_index, lower, upper, count), where
+            lower or upper is None for the open-ended bins.
+    """
+    values = values[~np.isnan(values)]
+    # method="lower" keeps edges on observed values, so 0/1 columns split exactly
+    edges = np.unique(np.quantile(values, np.linspace(0, 1, bins + 1), method="lower"))
+    # searchsorted(side="right") puts v in bin i when edges[i-1] <= v < edges[i]
+    counts = np.bincount(np.searchsorted(edges, values, side="right"), minlength=len(edges) + 1)
+    lowers = [None] + [float(edge) for edge in edges]
+    uppers = [float(edge) for edge in edges] + [None]
+    return [
+        (column_name, i, lowers[i], uppers[i], int(counts[i]))
+        for i in range(len(edges) + 1)
+    ]
+
+
+def build_baseline(conn: Connection, input_data_path: str, model, bins: int = DRIFT_BINS) -> None:
+    """
+    Build and store the drift baseline from the model's training data.
+
+    Rows are split with `models.model.prepare_data`, but features are taken
+    from `preprocess_housing_data` so the baseline is encoded exactly like the
+    rows ingested into 'cleaned_data'. Feature histograms use the training
+    split; the residual histogram uses the model's residuals on the held-out
+    test split. Columns that preprocessing leaves constant (such as dummy
+    columns it never fills) are left out of the baseline.
+
+    Args:
+        conn (Connection): SQLite connection object.
+        input_data_path (str): Path to the training CSV file.
+        model: Trained model used to compute baseline residuals.
+        bins (int): Number of quantile bins per column.
+
+    Raises:
+        ValueError: If the file is not in the training schema or most of
+            EXPECTED_FEATURES are missing from it.
+        sqlite3.Error: If the baseline cannot be saved.
+    """
+    logger.info(f"Building drift baseline from {input_data_path}...")
+    try:
+        X_train, X_test, y_train, y_test = prepare_data(input_data_path)
+    except KeyError as e:
+        logger.error(f"File {input_data_path} is not in the model's training schema: {e}")
+        raise ValueError(
+            f"File {input_data_path} is not in the model's training schema "
+            f"(lower-case columns including '{TARGET_COLUMN}'): {e}"
+        )
+
+    # prepare_data keeps the CSV row index, so its split selects the same rows
+    # from the preprocessed features
+    features, _ = preprocess_housing_data(input_data_path)
+    train_features = features.loc[X_train.index].astype(float)
+    test_features = features.loc[X_test.index].astype(float)
+    training_columns = sanitize_features(list(X_train.columns))
+
+    baseline = []
+    skipped = []
+    for feature, column in zip(EXPECTED_FEATURES, sanitize_features(EXPECTED_FEATURES)):
+        if column not in training_columns:
+            logger.warning(f"Column '{column}' not found in training data. Skipping drift baseline.")
+        elif train_features[feature].nunique() <= 1:
+            logger.warning(f"Column '{column}' is constant after preprocessing. Skipping drift baseline.")
+        else:
+            baseline += compute_bins(column, train_features[feature].to_numpy(), bins)
+            continue
+        skipped.append(column)
+
+    if len(skipped) > len(EXPECTED_FEATURES) / 2:
+        logger.error(f"Most expected features are missing from {input_data_path}: {skipped}")
+        raise ValueError(f"Most expected features are missing from {input_data_path}: {skipped}")
+
+    residuals = np.asarray(y_test, dtype=float) - np.asarray(predict(test_features, model), dtype=float)
+    baseline += compute_bins(RESIDUAL_COLUMN, residuals, bins)
+
+    create_drift_tables(conn)
+    save_drift_baseline(conn, baseline)
+
+
+def compute_drift_scores(
+    conn: Connection, run_id: Optional[int] = None, expected_rows: Optional[int] = None
+) -> pd.DataFrame:
+    """
+    Compute PSI and binned KS scores of ingested data against the baseline.
+
+    Only the stored histograms are read, so the cost does not depend on the
+    size of the 'cleaned_data' or 'predictions' tables.
+
+    Args:
+        conn (Connection): SQLite connection object.
+        run_id (Optional[int]): Score a single run. All runs are combined when omitted.
+        expected_rows (Optional[int]): Number of rows the scored data holds. Columns
+            whose histograms hold a different count (e.g. the baseline was built or
+            replaced while the run was in progress) are left out with a warning.
+
+    Returns:
+        pd.DataFrame: One row per monitored column with 'psi', 'ks' and 'rows'
+            (number of ingested values), indexed by column name. Columns with no
+            ingested values are left out.
+    """
+    histograms = pd.DataFrame(
+        get_histograms(conn, run_id),
+        columns=["column_name", "bin_index", "baseline", "current"]
+    )
+
+    scores = {}
+    incomplete = []
+    for column_name, hist in histograms.groupby("column_name", sort=True):
+        rows = int(hist["current"].sum())
+        if expected_rows is not None and rows != expected_rows:
+            incomplete.append(column_name)
+            continue
+        if rows == 0:
+            continue
+        expected = hist["baseline"].to_numpy(dtype=float) / hist["baseline"].sum()
+        actual = hist["current"].to_numpy(dtype=float) / rows
+        ks = float(np.max(np.abs(np.cumsum(actual) - np.cumsum(expected))))
+        expected = np.clip(expected, PSI_EPSILON, None)
+        actual = np.clip(actual, PSI_EPSILON, None)
+        psi = float(np.sum((actual - expected) * np.log(actual / expected)))
+        scores[column_name] = {"psi": psi, "ks": ks, "rows": rows}
+
+    if incomplete:
+        logger.warning(
+            f"Drift histograms do not cover all {expected_rows} rows for columns {incomplete}. "
+            "Skipping their drift scores."
+        )
+
+    return pd.DataFrame.from_dict(scores, orient="index", columns=["psi", "ks", "rows"])
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Build the drift baseline from the model's training data.")
+    parser.add_argument(
+        "train_data", nargs="?", default=TRAIN_DATA_FILE,
+        help=f"CSV the model was trained on (default: {TRAIN_DATA_FILE})"
+    )
+    args = parser.parse_args()
+
+    conn = create_connection(DB_FILE)
+    try:
+        build_baseline(conn, args.train_data, load_model(MODEL_FILE))
+    finally:
+        close_connection(conn)
@@ -0,0 +1,31 @@
+import pytest
+
+
+class DummyModel:
+    """Stand-in for the trained model so the pipeline can run without model.joblib."""
+
+    def predict(self, X):
+        return X["median_income"].to_numpy(dtype=float) * 40000
+
+
+@pytest.fixture
+def dummy_model():
+    return DummyModel()
+
+
+@pytest.fixture
+def pipeline(tmp_path, monkeypatch, dummy_model):
+    """
+    The `main` module with every file path pointed into tmp_path and the model
+    replaced by DummyModel. Tests write their input to `pipeline.DATA_FILE`.
+    """
+    import main
+
+    model_file = tmp_path / "model.joblib"
+    model_file.write_bytes(b"model v1")  # Only hashed; load_model is patched below
+    monkeypatch.setattr(main, "DATA_FILE", str(tmp_path / "housing.csv"))
+    monkeypatch.setattr(main, "MODEL_FILE", str(model_file))
+    monkeypatch.setattr(main, "DB_FILE", str(tmp_path / "housing_data.db"))
+    monkeypatch.setattr(main, "PREDICTIONS_FILE", str(tmp_path / "predictions.csv"))
+    monkeypatch.setattr(main, "load_model", lambda filename: dummy_model)
+    return main
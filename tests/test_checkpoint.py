@@ -0,0 +1,145 @@
+import pytest
+
+
+TEST_CSV = """longitude,latitude,housing_median_age,total_rooms,total_bedrooms,population,households,median_income,ocean_proximity,median_house_value
+-122.64,38.01,36.0,1336.0,258.0,678.0,249.0,5.5789,NEAR OCEAN,320201
+-115.73,33.35,23.0,1586.0,448.0,338.0,182.0,1.2132,INLAND,58815
+-117.96,33.89,24.0,1332.0,252.0,625.0,230.0,4.4375,<1H OCEAN,192575
+-122.25,37.85,52.0,1274.0,235.0,558.0,219.0,5.6431,NEAR BAY,341300
+-121.22,39.43,17.0,2254.0,485.0,1007.0,433.0,1.7000,INLAND,92300
+"""
+
+
+class InjectedFailure(Exception):
+    pass
+
+
+def fail_on_call(func, fail_at):
+    """Wrap func so that its call number `fail_at` (0-based) raises once."""
+    calls = {"count": 0}
+
+    def wrapper(*args, **kwargs):
+        calls["count"] += 1
+        if calls["count"] - 1 == fail_at:
+            raise InjectedFailure(f"Injected failure in {func.__name__}")
+        return func(*args, **kwargs)
+
+    return wrapper
+
+
+@pytest.fixture
+def pipeline(pipeline, monkeypatch):
+    with open(pipeline.DATA_FILE, "w") as f:
+        f.write(TEST_CSV)
+    monkeypatch.setattr(pipeline, "CHUNK_SIZE", 2)  # 5 rows -> 3 chunks
+    return pipeline
+
+
+def table_state(db_file):
+    import sqlite3
+
+    conn = sqlite3.connect(db_file)
+    try:
+        return {
+            "cleaned_data": conn.execute("SELECT COUNT(*) FROM cleaned_data").fetchone()[0],
+            "predictions": conn.execute("SELECT COUNT(*) FROM predictions").fetchone()[0],
+            "runs": conn.execute("SELECT id, status FROM runs ORDER BY id").fetchall(),
+            "progress": conn.execute("SELECT COUNT(*) FROM run_progress").fetchone()[0],
+        }
+    finally:
+        conn.close()
+
+
+@pytest.mark.parametrize(
+    "target, fail_at",
+    [
+        ("insert_cleaned_data_chunk", 0),
+        ("insert_cleaned_data_chunk", 1),
+        ("predict", 0),
+        ("predict", 2),
+        ("insert_predictions_chunk", 1),
+        ("get_run_predictions", 0),
+        ("finish_run", 0),
+    ],
+)
+def test_resume_after_injected_failure(pipeline, monkeypatch, target, fail_at):
+    original = getattr(pipeline, target)
+    monkeypatch.setattr(pipeline, target, fail_on_call(original, fail_at))
+
+    with pytest.raises(InjectedFailure):
+        pipeline.run_pipeline()
+
+    state = table_state(pipeline.DB_FILE)
+    assert state["runs"] == [(1, "failed")], "Interrupted run should be marked as failed"
+
+    # Restart without the failure: the same run must resume and finish without duplicates
+    monkeypatch.setattr(pipeline, target, original)
+    pipeline.run_pipeline()
+
+    state = table_state(pipeline.DB_FILE)
+    assert state["runs"] == [(1, "completed")], "Failed run should be resumed, not restarted"
+    assert state["cleaned_data"] == 5, "Cleaned data rows duplicated or missing after resume"
+    assert state["predictions"] == 5, "Prediction rows duplicated or missing after resume"
+    assert state["progress"] == 6, "Expected one marker per chunk and stage"
+
+    import pandas as pd
+    output = pd.read_csv(pipeline.PREDICTIONS_FILE)
+    assert list(output["Actual"]) == [320201, 58815, 192575, 341300, 92300]
+
+
+def test_completed_run_is_not_resumed(pipeline):
+    pipeline.run_pipeline()
+    pipeline.run_pipeline()
+
+    state = table_state(pipeline.DB_FILE)
+    assert state["runs"] == [(1, "completed"), (2, "completed")]
+    assert state["cleaned_data"] == 10
+
+
+def test_changed_model_starts_new_run(pipeline, monkeypatch):
+    original = pipeline.predict
+    monkeypatch.setattr(pipeline, "predict", fail_on_call(original, 1))
+    with pytest.raises(InjectedFailure):
+        pipeline.run_pipeline()
+
+    # A retry with a different model must not reuse the old model's prediction chunks
+    with open(pipeline.MODEL_FILE, "wb") as f:
+        f.write(b"model v2")
+    monkeypatch.setattr(pipeline, "predict", original)
+    pipeline.run_pipeline()
+
+    state = table_state(pipeline.DB_FILE)
+    assert state["runs"] == [(1, "failed"), (2, "completed")]
+    # Run 1 stored its first prediction chunk (2 rows) before failing; run 2 stores all 5
+    assert state["predictions"] == 2 + 5, "Run 2 should predict every chunk itself"
+
+
+def test_failed_chunk_insert_is_rolled_back(tmp_path):
+    import sqlite3
+    from db_handler.db_connector import create_connection, close_connection
+    from db_handler.db_query import create_cleaned_data_table, insert_cleaned_data_chunk
+    from db_handler.db_checkpoint import (
+        STAGE_CLEANED_DATA,
+        create_run_tables,
+        start_run,
+        get_completed_chunks,
+    )
+
+    conn = create_connection(str(tmp_path / "test_checkpoint.db"))
+    features = ["col1", "col2"]
+
+    try:
+        create_cleaned_data_table(conn, features)
+        create_run_tables(conn)
+        run_id = start_run(conn, "input.csv", "abc", 2)
+
+        insert_cleaned_data_chunk(conn, features, [(1.0, 2.0, 3.0)], run_id, 0)
+
+        # Second row has a missing value, so the insert fails halfway through the chunk
+        with pytest.raises(sqlite3.Error):
+            insert_cleaned_data_chunk(conn, features, [(4.0, 5.0, 6.0), (7.0, 8.0)], run_id, 1)
+
+        assert conn.execute("SELECT COUNT(*) FROM cleaned_data").fetchone()[0] == 1
+        assert get_completed_chunks(conn, run_id, STAGE_CLEANED_DATA) == {0}
+    finally:
+        close_connection(conn)
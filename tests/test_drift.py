@@ -0,0 +1,183 @@
+import pytest
+
+
+def write_housing_csv(path, income_scale=1.0, rows=2000, seed=0):
+    import numpy as np
+    import pandas as pd
+
+    rng = np.random.default_rng(seed)
+    median_income = rng.gamma(4.0, 1.0, rows) * income_scale
+    df = pd.DataFrame({
+        "longitude": rng.uniform(-124, -114, rows),
+        "latitude": rng.uniform(32, 42, rows),
+        "housing_median_age": rng.integers(1, 52, rows).astype(float),
+        "total_rooms": rng.integers(100, 5000, rows).astype(float),
+        "total_bedrooms": rng.integers(20, 1000, rows).astype(float),
+        "population": rng.integers(50, 3000, rows).astype(float),
+        "households": rng.integers(20, 1000, rows).astype(float),
+        "median_income": median_income,
+        "ocean_proximity": rng.choice(["<1H OCEAN", "INLAND", "ISLAND", "NEAR BAY", "NEAR OCEAN"], rows),
+        "median_house_value": median_income * 40000 + rng.normal(0, 20000, rows),
+    })
+    df.to_csv(path, index=False)
+
+
+@pytest.fixture
+def pipeline(pipeline, monkeypatch, dummy_model):
+    write_housing_csv(pipeline.DATA_FILE)
+    monkeypatch.setattr(pipeline, "CHUNK_SIZE", 500)
+    build_baseline_from(pipeline.DB_FILE, pipeline.DATA_FILE, dummy_model)
+    return pipeline
+
+
+def build_baseline_from(db_file, path, model):
+    from db_handler.db_connector import create_connection, close_connection
+    from monitoring.drift import build_baseline
+
+    conn = create_connection(db_file)
+    try:
+        build_baseline(conn, path, model)
+    finally:
+        close_connection(conn)
+
+
+def drift_scores(db_file, run_id=None, expected_rows=None):
+    from db_handler.db_connector import create_connection, close_connection
+    from monitoring.drift import compute_drift_scores
+
+    conn = create_connection(db_file)
+    try:
+        return compute_drift_scores(conn, run_id, expected_rows)
+    finally:
+        close_connection(conn)
+
+
+def test_compute_bins():
+    import numpy as np
+    from monitoring.drift import compute_bins
+
+    binary = compute_bins("flag", np.array([0.0, 0.0, 0.0, 1.0]))
+    assert binary == [
+        ("flag", 0, None, 0.0, 0),
+        ("flag", 1, 0.0, 1.0, 3),
+        ("flag", 2, 1.0, None, 1),
+    ]
+
+    values = np.arange(100, dtype=float)
+    continuous = compute_bins("value", values, bins=10)
+    assert len(continuous) == 12, "Expected 11 edges plus two open-ended bins"
+    assert sum(row[4] for row in continuous) == 100
+
+
+def test_histograms_updated_incrementally(pipeline):
+    pipeline.run_pipeline()
+
+    scores = drift_scores(pipeline.DB_FILE)
+    assert scores.loc["median_income", "rows"] == 2000, "Every ingested row should be binned once"
+    assert scores.loc["residual", "rows"] == 2000, "Every prediction should be binned once"
+    assert (scores["psi"] < 0.1).all(), f"Same data should not drift:\n{scores}"
+
+
+def test_drift_detected_for_shifted_input(pipeline):
+    pipeline.run_pipeline()
+    write_housing_csv(pipeline.DATA_FILE, income_scale=3.0, seed=1)
+    pipeline.run_pipeline()
+
+    first = drift_scores(pipeline.DB_FILE, run_id=1)
+    second = drift_scores(pipeline.DB_FILE, run_id=2)
+    assert first.loc["median_income", "psi"] < 0.1
+    assert second.loc["median_income", "psi"] > 0.2, "Shifted income should be reported as drift"
+    assert second.loc["median_income", "ks"] > first.loc["median_income", "ks"]
+    assert second.loc["longitude", "psi"] < 0.1, "Unchanged columns should not drift"
+
+
+def test_resumed_run_does_not_double_count(pipeline, monkeypatch):
+    original = pipeline.insert_predictions_chunk
+    calls = {"count": 0}
+
+    def failing_insert(*args, **kwargs):
+        calls["count"] += 1
+        if calls["count"] == 2:
+            raise RuntimeError("Injected failure")
+        return original(*args, **kwargs)
+
+    monkeypatch.setattr(pipeline, "insert_predictions_chunk", failing_insert)
+    with pytest.raises(RuntimeError):
+        pipeline.run_pipeline()
+
+    monkeypatch.setattr(pipeline, "insert_predictions_chunk", original)
+    pipeline.run_pipeline()
+
+    scores = drift_scores(pipeline.DB_FILE)
+    assert scores.loc["median_income", "rows"] == 2000
+    assert scores.loc["residual", "rows"] == 2000
+
+
+def test_baseline_rejects_inference_feed(tmp_path, dummy_model):
+    # data/housing.csv uses the feed header (LAT, MEDIAN_AGE, ..., AGENCY) and "Null" strings
+    with pytest.raises(ValueError, match="training schema"):
+        build_baseline_from(str(tmp_path / "drift.db"), "data/housing.csv", dummy_model)
+
+
+def test_baseline_rejects_missing_features(tmp_path, dummy_model):
+    train_file = tmp_path / "train.csv"
+    train_file.write_text(
+        "longitude,latitude,median_income,median_house_value\n"
+        + "".join(f"-122.{i},37.{i},{i % 7 + 1}.5,{100000 + i * 1000}\n" for i in range(20))
+    )
+    with pytest.raises(ValueError, match="Most expected features are missing"):
+        build_baseline_from(str(tmp_path / "drift.db"), str(train_file), dummy_model)
+
+
+def test_no_false_alarm_on_real_feed(pipeline, dummy_model):
+    import pandas as pd
+    from config import DRIFT_PSI_THRESHOLD
+
+    # Baseline from data/housing.csv converted to the training schema, then the
+    # feed itself ingested through the pipeline: nothing should be reported as drift
+    train = pd.read_csv("data/housing.csv", na_values="Null").rename(columns={
+        "LONGITUDE": "longitude", "LAT": "latitude", "MEDIAN_AGE": "housing_median_age",
+        "ROOMS": "total_rooms", "BEDROOMS": "total_bedrooms", "POP": "population",
+        "HOUSEHOLDS": "households", "MEDIAN_INCOME": "median_income",
+        "MEDIAN_HOUSE_VALUE": "median_house_value", "OCEAN_PROXIMITY": "ocean_proximity",
+    }).drop(columns=["AGENCY"])
+    train_file = pipeline.DATA_FILE + ".train.csv"
+    train.to_csv(train_file, index=False)
+    build_baseline_from(pipeline.DB_FILE, train_file, dummy_model)
+
+    with open("data/housing.csv") as src, open(pipeline.DATA_FILE, "w") as dst:
+        dst.write(src.read())
+    pipeline.CHUNK_SIZE = 5000
+    pipeline.run_pipeline()
+
+    scores = drift_scores(pipeline.DB_FILE, run_id=1)
+    assert "ocean_proximity_NEAR_BAY" not in scores.index, "Columns preprocessing never fills have no baseline"
+    assert (scores["psi"] <= DRIFT_PSI_THRESHOLD).all(), f"Unexpected drift on the training data:\n{scores}"
+
+
+def test_partially_tracked_run_is_not_scored(pipeline, monkeypatch):
+    # First attempt runs before the baseline is visible and fails during predictions
+    original = pipeline.insert_predictions_chunk
+    calls = {"count": 0}
+
+    def failing_insert(*args, **kwargs):
+        calls["count"] += 1
+        if calls["count"] == 2:
+            raise RuntimeError("Injected failure")
+        return original(*args, **kwargs)
+
+    has_drift_baseline = pipeline.has_drift_baseline
+    monkeypatch.setattr(pipeline, "has_drift_baseline", lambda conn: False)
+    monkeypatch.setattr(pipeline, "insert_predictions_chunk", failing_insert)
+    with pytest.raises(RuntimeError):
+        pipeline.run_pipeline()
+
+    # The resumed attempt tracks drift, but only for the chunks it writes itself
+    monkeypatch.setattr(pipeline, "has_drift_baseline", has_drift_baseline)
+    monkeypatch.setattr(pipeline, "insert_predictions_chunk", original)
+    pipeline.run_pipeline()
+
+    assert drift_scores(pipeline.DB_FILE, run_id=1)["rows"].max() < 2000
+    assert drift_scores(pipeline.DB_FILE, run_id=1, expected_rows=2000).empty, (
+        "Partial histograms should not be scored"
+    )